@@ -2,8 +2,9 @@
 Example experiment config that co-launches policy servers with each job.
 
 Usage:
-    python scripts/batch_eval.py --config experiments/with_servers.py
-    python scripts/batch_eval.py --config experiments/with_servers.py --dry-run
+    python scripts/batch_eval.py --config experiments/example.py
+    python scripts/batch_eval.py --config experiments/example.py --dry-run
+    python scripts/batch_eval.py --config experiments/example.py --gpus 0 1
 """
 
 from polaris.config import EvalArgs, PolicyArgs, BatchConfig, PolicyServer, JobCfg
@@ -17,29 +18,36 @@ determined at runtime.
 PI0_FAST_SERVER = PolicyServer(
     name="pi0_fast",
     command=" ".join([
-        "XLA_PYTHON_CLIENT_MEM_FRACTION=0.35",
         "~/projects/PolaRiS/third_party/openpi/.venv/bin/python",
         "~/projects/PolaRiS/third_party/openpi/scripts/serve_policy.py",
         "--port {port}",
         "policy:checkpoint --policy.config pi0_fast_droid_jointpos",
         "--policy.dir gs://openpi-assets/checkpoints/polaris/pi0_fast_droid_jointpos_polaris",
     ]),
+    env={"XLA_PYTHON_CLIENT_MEM_FRACTION": "0.35"},
     ready_message="server listening on",
 )
 
 PI05_SERVER = PolicyServer(
     name="pi05",
     command=" ".join([
-        "XLA_PYTHON_CLIENT_MEM_FRACTION=0.35",
         "~/projects/PolaRiS/third_party/openpi/.venv/bin/python",
         "~/projects/PolaRiS/third_party/openpi/scripts/serve_policy.py",
         "--port {port}",
         "policy:checkpoint --policy.config pi05_droid_jointpos",
         "--policy.dir gs://openpi-assets/checkpoints/polaris/pi05_droid_jointpos_polaris",
     ]),
+    env={"XLA_PYTHON_CLIENT_MEM_FRACTION": "0.35"},
     ready_message="server listening on",
 )
 
+# Jobs sharing a policy config reference one interned PolicyArgs, like they share a server
+PI05_POLICY = PolicyArgs.intern(
+    name="pi05_droid_jointpos_cotrained",
+    client="DroidJointPos",
+    open_loop_horizon=8,
+)
+
 # Each job references its server. The server will be launched on the same GPU as the job.
 config = BatchConfig(
     jobs=[
@@ -48,33 +56,24 @@ config = BatchConfig(
             server=PI05_SERVER,
             eval_args=EvalArgs(
                 environment="DROID-MoveLatteCup",
-                policy=PolicyArgs(
-                    name="pi05_droid_jointpos_cotrained",
-                    client="DroidJointPos",
-                    open_loop_horizon=8,
-                ),
+                run_folder="runs/example/DROID-MoveLatteCup",
+                policy=PI05_POLICY,
             ),
         ),
         JobCfg(
             server=PI05_SERVER,
             eval_args=EvalArgs(
                 environment="DROID-OrganizeTools",
-                policy=PolicyArgs(
-                    name="pi05_droid_jointpos_cotrained",
-                    client="DroidJointPos",
-                    open_loop_horizon=8,
-                ),
+                run_folder="runs/example/DROID-OrganizeTools",
+                policy=PI05_POLICY,
             ),
         ),
         JobCfg(
             server=PI05_SERVER,
             eval_args=EvalArgs(
                 environment="DROID-TapeIntoContainer",
-                policy=PolicyArgs(
-                    name="pi05_droid_jointpos_cotrained",
-                    client="DroidJointPos",
-                    open_loop_horizon=8,
-                ),
+                run_folder="runs/example/DROID-TapeIntoContainer",
+                policy=PI05_POLICY,
             ),
         ),
 
@@ -82,11 +81,8 @@ config = BatchConfig(
             server=PI05_SERVER,
             eval_args=EvalArgs(
                 environment="DROID-FoodBussing",
-                policy=PolicyArgs(
-                    name="pi05_droid_jointpos_cotrained",
-                    client="DroidJointPos",
-                    open_loop_horizon=8,
-                ),
+                run_folder="runs/example/DROID-FoodBussing",
+                policy=PI05_POLICY,
             ),
         ),
 
@@ -0,0 +1,14 @@
+"""
+Run a batch of evaluation jobs defined in an experiment config, co-launching
+the policy servers they reference.
+
+# Example commands:
+#   uv run scripts/batch_eval.py --config experiments/example.py --dry-run
+#   uv run scripts/batch_eval.py --config experiments/example.py --gpus 0 1
+"""
+
+from polaris.batch import main
+
+
+if __name__ == "__main__":
+    main()
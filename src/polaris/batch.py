@@ -0,0 +1,518 @@
+"""
+Batch evaluation runner.
+
+Runs every JobCfg of a BatchConfig as a separate `scripts/eval.py` process (Isaac Sim
+only supports one app per interpreter), co-launching the policy servers the jobs need.
+Servers are pooled per (server, GPU) and reused by every job on that GPU.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import importlib.util
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import tyro
+
+from polaris.config import BatchConfig, EvalArgs, JobCfg, PolicyServer
+
+
+@dataclass
+class Args:
+    """Run a batch of evaluation jobs with co-launched policy servers."""
+
+    config: Path
+    """Python file defining a module-level `config: BatchConfig`"""
+
+    gpus: tuple[int, ...] = (0,)
+    """GPUs to spread jobs across; each GPU gets one worker running one job at a time"""
+
+    eval_script: Path = Path("scripts/eval.py")
+    """Evaluation entry point launched for each job"""
+
+    server_timeout: float = 600.0
+    """Seconds to wait for a policy server to print its ready message"""
+
+    pin_cpus: bool = True
+    """Pin each job to the CPUs of its GPU's NUMA node (Linux with nvidia-smi and taskset)"""
+
+    skip_warmup: bool = False
+    """Don't pre-build the splat rasterizer extensions before launching jobs"""
+
+    dry_run: bool = False
+    """Print the jobs and commands without launching anything"""
+
+
+def load_batch_config(path: Path) -> BatchConfig:
+    """Import a config file and return its module-level `config`."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise FileNotFoundError(f"Could not load batch config from {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    config = getattr(module, "config", None)
+    if not isinstance(config, BatchConfig):
+        raise ValueError(f"{path} must define `config = BatchConfig(...)`")
+    return config
+
+
+def allocate_ports(n: int) -> list[int]:
+    """
+    Reserve `n` distinct free ports in one pass. All sockets are held open together so
+    the kernel cannot hand out the same port twice, then released for the servers.
+    """
+    sockets = []
+    try:
+        for _ in range(n):
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind(("", 0))
+            sockets.append(s)
+        return [s.getsockname()[1] for s in sockets]
+    finally:
+        for s in sockets:
+            s.close()
+
+
+def _cli_args(obj, prefix: str = "") -> list[str]:
+    """Flatten a (nested) config dataclass into tyro-style CLI flags."""
+    args = []
+    for config_field in dataclasses.fields(obj):
+        if config_field.name.startswith("_"):
+            continue
+        value = getattr(obj, config_field.name)
+        if value is None and config_field.default is None:
+            continue
+        flag = f"{prefix}{config_field.name.replace('_', '-')}"
+        if dataclasses.is_dataclass(value):
+            args += _cli_args(value, prefix=f"{flag}.")
+        elif isinstance(value, bool):
+            *parents, name = flag.split(".")
+            args.append("--" + ".".join([*parents, name if value else f"no-{name}"]))
+        else:
+            args += [f"--{flag}", str(value)]
+    return args
+
+
+def eval_command(eval_script: Path, eval_args: EvalArgs) -> list[str]:
+    return [sys.executable, str(eval_script), *_cli_args(eval_args)]
+
+
+def _is_env_assignment(token: str) -> bool:
+    name, sep, _ = token.partition("=")
+    return bool(sep) and name.isidentifier()
+
+
+def server_argv(server: PolicyServer, port: int) -> tuple[dict[str, str], list[str]]:
+    """
+    Build (env, argv) for launching `server` without a shell. Leading VAR=value
+    tokens become environment variables and ~ is expanded like a shell would.
+    """
+    tokens = [t.replace("{port}", str(port)) for t in server.cmd_template]
+    env = {}
+    while tokens and _is_env_assignment(tokens[0]):
+        name, _, value = tokens.pop(0).partition("=")
+        env[name] = value
+    return env, [os.path.expanduser(t) for t in tokens]
+
+
+def gpu_env(gpu: int) -> dict[str, str]:
+    """
+    Environment variables selecting `gpu`. CUDA orders devices fastest-first by
+    default; use PCI order so the index means the same card as in nvidia-smi.
+    """
+    return {"CUDA_DEVICE_ORDER": "PCI_BUS_ID", "CUDA_VISIBLE_DEVICES": str(gpu)}
+
+
+async def start_server(
+    server: PolicyServer, port: int, gpu: int
+) -> asyncio.subprocess.Process:
+    """Launch a policy server on `gpu` with `{port}` substituted into its command."""
+    env, argv = server_argv(server, port)
+    print(f"[batch] Starting server '{server.name}' on GPU {gpu}, port {port}")
+    return await asyncio.create_subprocess_exec(
+        *argv,
+        env={**os.environ, **server.env, **env, **gpu_env(gpu)},
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
+    )
+
+
+async def _read_until_ready(proc: asyncio.subprocess.Process, ready_message: str) -> bool:
+    assert proc.stdout is not None
+    tail = ""
+    # Read chunks rather than lines: progress bars can emit very long lines
+    while chunk := await proc.stdout.read(4096):
+        text = chunk.decode(errors="replace")
+        sys.stdout.write(text)
+        # Keep a tail in case the ready message is split across reads
+        tail = (tail + text)[-(len(ready_message) + 4096) :]
+        if ready_message in tail:
+            return True
+    return False
+
+
+async def wait_until_ready(
+    proc: asyncio.subprocess.Process, server: PolicyServer, timeout: float
+) -> None:
+    """Wait until the server prints `ready_message`, streaming its output meanwhile."""
+    try:
+        ready = await asyncio.wait_for(
+            _read_until_ready(proc, server.ready_message), timeout
+        )
+    except asyncio.TimeoutError:
+        ready = False
+    if not ready:
+        await stop_server(proc)
+        raise RuntimeError(
+            f"Policy server '{server.name}' did not become ready "
+            f"(exit code {proc.returncode})"
+        )
+
+
+async def _forward_output(proc: asyncio.subprocess.Process) -> None:
+    assert proc.stdout is not None
+    while chunk := await proc.stdout.read(4096):
+        sys.stdout.write(chunk.decode(errors="replace"))
+
+
+async def stop_server(proc: asyncio.subprocess.Process, timeout: float = 10.0) -> None:
+    """Terminate the server's whole process group, including any children it spawned."""
+    if proc.returncode is not None:
+        return
+    # The group can already be gone while returncode is still unset, e.g. a server
+    # that crashed at startup and was reaped but not yet reported
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(proc.wait(), timeout)
+    except asyncio.TimeoutError:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+
+
+async def _is_listening(port: int) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection("127.0.0.1", port), timeout=1.0
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+@dataclass
+class ServerPool:
+    """
+    Policy servers kept alive for the whole batch, keyed by (server name, GPU).
+
+    A server is started the first time a job on that GPU needs it (or up front with
+    `start_all`) and handed to every later job on the same GPU, so checkpoint loading
+    and XLA warmup happen once. All server I/O runs on one event loop in a background
+    thread; GPU workers call into it with `acquire`.
+    """
+
+    timeout: float = 600.0
+    ports: dict[tuple[str, int], int] = field(default_factory=dict)
+    """Ports assigned up front to each (server name, GPU)"""
+    _servers: dict[tuple[str, int], tuple[asyncio.subprocess.Process, int]] = field(
+        default_factory=dict
+    )
+    _launched: list[asyncio.subprocess.Process] = field(default_factory=list)
+    _locks: dict[tuple[str, int], asyncio.Lock] = field(default_factory=dict)
+    _forwarders: set[asyncio.Task] = field(default_factory=set)
+    _loop: asyncio.AbstractEventLoop = field(default_factory=asyncio.new_event_loop)
+
+    def __post_init__(self):
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="servers", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def acquire(self, server: PolicyServer, gpu: int) -> int:
+        """Return the port of a ready `server` on `gpu`, starting it if needed."""
+        return self._run(self._acquire(server, gpu))
+
+    def start_all(self, pairs: list[tuple[PolicyServer, int]]) -> None:
+        """
+        Start the servers for all (server, GPU) pairs concurrently, so their load
+        times overlap. Failures are reported and retried when a job needs the server.
+        """
+        self._run(self._start_all(pairs))
+
+    def drain(self) -> None:
+        """Stop every server in the pool and shut down the event loop."""
+        self._run(self._drain())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _acquire(self, server: PolicyServer, gpu: int) -> int:
+        key = (server.name, gpu)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = self._servers.pop(key, None)
+            if entry is not None:
+                proc, port = entry
+                if proc.returncode is None and await _is_listening(port):
+                    self._servers[key] = entry
+                    return port
+                print(f"[batch] Server '{server.name}' on GPU {gpu} is gone, restarting")
+                await stop_server(proc)
+                # The old port may still be held by the dead server's children
+                self.ports.pop(key, None)
+
+            port = self.ports.get(key)
+            if port is None:
+                port = self.ports[key] = allocate_ports(1)[0]
+            proc = await start_server(server, port, gpu)
+            self._launched.append(proc)
+            await wait_until_ready(proc, server, self.timeout)
+            # Keep draining so the server never blocks on a full pipe
+            forwarder = asyncio.create_task(_forward_output(proc))
+            self._forwarders.add(forwarder)
+            forwarder.add_done_callback(self._forwarders.discard)
+            self._servers[key] = (proc, port)
+            return port
+
+    async def _start_all(self, pairs: list[tuple[PolicyServer, int]]) -> None:
+        results = await asyncio.gather(
+            *(self._acquire(server, gpu) for server, gpu in pairs), return_exceptions=True
+        )
+        for (server, gpu), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                print(f"[batch] Server '{server.name}' on GPU {gpu} failed to start: {result}")
+
+    async def _drain(self) -> None:
+        self._servers.clear()
+        await asyncio.gather(*(stop_server(proc) for proc in self._launched))
+        self._launched.clear()
+        for forwarder in list(self._forwarders):
+            forwarder.cancel()
+
+
+def _parse_cpulist(text: str) -> set[int]:
+    """Parse a sysfs cpulist such as "0-15,32-47"."""
+    cpus = set()
+    for part in text.strip().split(","):
+        if part:
+            lo, _, hi = part.partition("-")
+            cpus.update(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def gpu_numa_cpus(gpu: int) -> set[int] | None:
+    """CPUs on the NUMA node attached to `gpu`, or None if that can't be determined."""
+    try:
+        # nvidia-smi indexes GPUs in PCI order, matching gpu_env's CUDA_DEVICE_ORDER
+        bus_id = subprocess.run(
+            ["nvidia-smi", "--query-gpu=pci.bus_id", "--format=csv,noheader", "-i", str(gpu)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        # nvidia-smi reports an 8-digit PCI domain, sysfs uses 4
+        domain, _, rest = bus_id.partition(":")
+        device = Path(f"/sys/bus/pci/devices/{domain[-4:]}:{rest}".lower())
+        node = int((device / "numa_node").read_text())
+        if node < 0:
+            return None
+        cpus = _parse_cpulist(Path(f"/sys/devices/system/node/node{node}/cpulist").read_text())
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+    return (cpus & os.sched_getaffinity(0)) or None
+
+
+def cpu_affinity(gpus: tuple[int, ...]) -> dict[int, tuple[set[int], int]]:
+    """
+    Map each GPU to (cpus, omp_threads): the CPUs of its NUMA node, and an
+    OMP_NUM_THREADS that splits those CPUs between the workers sharing the node.
+    """
+    if shutil.which("taskset") is None:
+        print("[batch] Warning: taskset not found, not pinning CPUs")
+        return {}
+    node_cpus = {gpu: gpu_numa_cpus(gpu) for gpu in gpus}
+    affinity = {}
+    for gpu, cpus in node_cpus.items():
+        if cpus is None:
+            continue
+        workers_on_node = sum(1 for other in node_cpus.values() if other == cpus)
+        affinity[gpu] = (cpus, max(1, len(cpus) // workers_on_node))
+    return affinity
+
+
+def run_job(
+    job: JobCfg,
+    gpu: int,
+    eval_script: Path,
+    servers: ServerPool,
+    affinity: tuple[set[int], int] | None = None,
+) -> int:
+    """Run a single eval job on `gpu` and return its exit code."""
+    eval_args = job.eval_args
+    if job.server is not None:
+        port = servers.acquire(job.server, gpu)
+        # Don't mutate the user's PolicyArgs, they may be shared between jobs
+        eval_args = dataclasses.replace(
+            eval_args, policy=dataclasses.replace(eval_args.policy, port=port)
+        )
+    env = {**os.environ, **gpu_env(gpu)}
+    command = eval_command(eval_script, eval_args)
+    if affinity is not None:
+        env["OMP_NUM_THREADS"] = str(affinity[1])
+        # Pin before exec, so every thread the job ever starts inherits the CPU set
+        cpulist = ",".join(str(cpu) for cpu in sorted(affinity[0]))
+        command = ["taskset", "-c", cpulist, *command]
+    print(f"[batch] Running {eval_args.environment} on GPU {gpu}")
+    return subprocess.run(command, env=env).returncode
+
+
+def gpu_worker(
+    gpu: int,
+    jobs: "queue.Queue[tuple[int, JobCfg]]",
+    codes: list[int],
+    eval_script: Path,
+    servers: ServerPool,
+    stop: threading.Event,
+    affinity: tuple[set[int], int] | None = None,
+) -> None:
+    """
+    Long-lived worker pinned to one GPU, pulling jobs until the queue is empty or
+    `stop` is set.
+    """
+    while not stop.is_set():
+        try:
+            idx, job = jobs.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            codes[idx] = run_job(job, gpu, eval_script, servers, affinity)
+        except Exception as exc:  # noqa: BLE001 - reported in the summary
+            print(f"[batch] {job.eval_args.environment} failed on GPU {gpu}: {exc}")
+            codes[idx] = -1
+
+
+# CUDA extensions that are JIT-compiled on first import by every eval process
+_WARMUP_MODULES = ("diff_surfel_rasterization", "simple_knn")
+
+
+def warm_up(gpu: int) -> None:
+    """
+    Import the JIT-compiled extensions once in a single process, so parallel jobs
+    load the cached build instead of all starting cold on the same compile.
+    """
+    print(f"[batch] Warming up {', '.join(_WARMUP_MODULES)}")
+    code = subprocess.run(
+        [sys.executable, "-c", "; ".join(f"import {m}" for m in _WARMUP_MODULES)],
+        env={**os.environ, **gpu_env(gpu)},
+    ).returncode
+    if code != 0:
+        print(f"[batch] Warning: warm-up failed (exit code {code}), continuing")
+
+
+def group_jobs_by_server(
+    config: BatchConfig,
+) -> list[tuple[PolicyServer | None, list[JobCfg]]]:
+    """Group jobs by server identity, keeping the order servers first appear in."""
+    soa = config.as_soa()
+    # Server indices follow first appearance, so a stable sort yields the groups in order
+    order = np.argsort(soa.server_idx, kind="stable")
+    bounds = np.flatnonzero(np.diff(soa.server_idx[order])) + 1
+    return [
+        (soa.servers[soa.server_idx[group[0]]], [config.jobs[i] for i in group])
+        for group in np.split(order, bounds)
+        if len(group)
+    ]
+
+
+def main(args: Args | None = None) -> None:
+    if args is None:
+        args = tyro.cli(Args)
+
+    config = load_batch_config(args.config)
+    groups = group_jobs_by_server(config)
+
+    if args.dry_run:
+        for server, jobs in groups:
+            if server is not None:
+                env = "".join(f"{name}={value} " for name, value in server.env.items())
+                print(f"[server] {server.name}: {env}{server.command}")
+            for job in jobs:
+                print("    " + " ".join(eval_command(args.eval_script, job.eval_args)))
+        return
+
+    if not args.skip_warmup:
+        warm_up(args.gpus[0])
+
+    # Jobs sharing a server are queued back to back so each GPU's server stays warm
+    jobs = [job for _, group in groups for job in group]
+    pending: queue.Queue[tuple[int, JobCfg]] = queue.Queue()
+    for idx, job in enumerate(jobs):
+        pending.put((idx, job))
+
+    # Jobs are external processes, so one thread per GPU is enough to drive them
+    codes = [-1] * len(jobs)
+    # Every (server, GPU) pair a worker might need gets its port in a single pass
+    servers_by_name = {job.server.name: job.server for job in jobs if job.server is not None}
+    pairs = [(server, gpu) for server in servers_by_name.values() for gpu in args.gpus]
+    keys = [(server.name, gpu) for server, gpu in pairs]
+    ports = dict(zip(keys, allocate_ports(len(keys))))
+    servers = ServerPool(timeout=args.server_timeout, ports=ports)
+    affinity = cpu_affinity(args.gpus) if args.pin_cpus else {}
+    stop = threading.Event()
+    workers = [
+        threading.Thread(
+            target=gpu_worker,
+            args=(gpu, pending, codes, args.eval_script, servers, stop, affinity.get(gpu)),
+            name=f"gpu{gpu}",
+        )
+        for gpu in args.gpus
+    ]
+    # Pre-start each server on no more GPUs than it has jobs, so a server used by one
+    # job doesn't sit on every GPU; any other pair starts lazily if a worker needs it
+    jobs_per_server = Counter(job.server.name for job in jobs if job.server is not None)
+    warm_pairs = [
+        (server, gpu)
+        for server in servers_by_name.values()
+        for gpu in args.gpus[: jobs_per_server[server.name]]
+    ]
+    try:
+        # Bring those servers up together so time-to-first-job is the slowest single load
+        servers.start_all(warm_pairs)
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    finally:
+        # On an interrupt, let running jobs finish but start no new ones, and only then
+        # stop the servers, so no worker launches a server or uses the pool after drain
+        stop.set()
+        for worker in workers:
+            if worker.is_alive():
+                worker.join()
+        servers.drain()
+    results = [(job.eval_args.environment, code) for job, code in zip(jobs, codes)]
+
+    print("[batch] Summary:")
+    for environment, code in results:
+        print(f"    {environment}: {'ok' if code == 0 else f'failed ({code})'}")
+    if any(code != 0 for _, code in results):
+        sys.exit(1)
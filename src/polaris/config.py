@@ -3,7 +3,10 @@ Lightweight config dataclasses for evaluation.
 No heavy dependencies - safe to import anywhere.
 """
 
-from dataclasses import dataclass
+import shlex
+from dataclasses import dataclass, field
+from functools import cached_property
+from types import SimpleNamespace
 
 
 @dataclass
@@ -13,33 +16,60 @@ class PolicyServer:
 
     Use {port} placeholder in command - it will be replaced with an auto-assigned free port.
     Jobs using this server will automatically have their policy.port updated.
+    The command is run without a shell: ~ is expanded by the launcher (as are leading
+    VAR=value assignments, though `env` is preferred), other shell syntax is not supported.
 
     Example:
         PolicyServer(
             name="pi0",
-            command="CUDA_VISIBLE_DEVICES=0 python serve_policy.py --port {port}",
+            command="python serve_policy.py --port {port}",
+            env={"XLA_PYTHON_CLIENT_MEM_FRACTION": "0.35"},
         )
     """
 
     name: str  # Friendly name for logging (also used to match jobs to servers)
-    command: str  # Shell command with {port} placeholder
+    command: str  # Command with {port} placeholder
     ready_message: str = (
         "Application startup complete"  # Message indicating server is ready
     )
+    env: dict[str, str] = field(default_factory=dict)  # Extra environment variables
 
     # Runtime-assigned (don't set manually)
     _assigned_port: int | None = None
 
+    @cached_property
+    def cmd_template(self) -> list[str]:
+        """Command tokens, split once. {port} is substituted per launch."""
+        return shlex.split(self.command)
 
-@dataclass
+
+@dataclass(frozen=True)
 class PolicyArgs:
-    """Policy configuration."""
+    """
+    Policy configuration. Frozen so identical configs can be shared between jobs;
+    use dataclasses.replace to derive a modified copy.
+    """
 
-    # name: str                              # Policy name (pi05_droid_jointpos, pi0_fast_droid_jointpos, etc.)
+    name: str | None = None  # Policy name (pi05_droid_jointpos, pi0_fast_droid_jointpos, etc.)
     client: str = "DroidJointPos"  # Client name (DroidJointPos, Fake, etc.)
     host: str = "0.0.0.0"
     port: int = 8000
     open_loop_horizon: int | None = 8
+    # Request the next action chunk one step early, from the observation before the last
+    # action of the current chunk (DiffusionPolicy client only). Changes what the policy sees.
+    prefetch: bool = False
+    # Resize camera frames with cv2 rather than openpi's PIL resize_with_pad (DiffusionPolicy
+    # client only). Faster, but the pixels differ slightly, so results can shift.
+    fast_resize: bool = False
+
+    @classmethod
+    def intern(cls, **kwargs) -> "PolicyArgs":
+        """Return the shared instance equal to PolicyArgs(**kwargs)."""
+        args = cls(**kwargs)
+        return _INTERNED_POLICY_ARGS.setdefault(args, args)
+
+
+_INTERNED_POLICY_ARGS: dict[PolicyArgs, PolicyArgs] = {}
 
 
 @dataclass
@@ -69,6 +99,31 @@ class BatchConfig:
 
     jobs: list[JobCfg]
 
+    def as_soa(self) -> SimpleNamespace:
+        """
+        Columnar (structure-of-arrays) view of the jobs for scheduling passes.
+
+        Servers are interned by identity in order of first appearance (no server is an
+        entry too), and `server_idx[i]` indexes `servers` for job i.
+        """
+        import numpy as np  # Only needed by the batch runner
+
+        index: dict[int, int] = {}
+        servers = []
+        server_idx = []
+        for job in self.jobs:
+            if id(job.server) not in index:
+                index[id(job.server)] = len(servers)
+                servers.append(job.server)
+            server_idx.append(index[id(job.server)])
+
+        servers_arr = np.empty(len(servers), dtype=object)
+        servers_arr[:] = servers
+        return SimpleNamespace(
+            servers=servers_arr,
+            server_idx=np.asarray(server_idx, dtype=np.int64),
+        )
+
     # @staticmethod # let users do this on their own if they want
     # def sweep(**kwargs: list[Any]) -> list[dict[str, Any]]:
     #     """
@@ -1,6 +1,7 @@
 import torch
 import cv2
 from pathlib import Path
+from typing import Callable
 import numpy as np
 
 from isaaclab.sensors.camera.camera import Camera
@@ -23,6 +24,7 @@ class ManagerBasedRLSplatEnv(ManagerBasedRLEnv):
         cfg: ManagerBasedRLEnvCfg,
         *args,
         rubric: Rubric | None = None,
+        rubric_factory: Callable[[], Rubric] | None = None,
         usd_file: str | None = None,
         show_target_marker: bool = False,
         **kwargs,
@@ -35,6 +37,9 @@ class ManagerBasedRLSplatEnv(ManagerBasedRLEnv):
         super().__init__(cfg=cfg, *args, **kwargs)
         self.setup_splat_world_and_robot_views()
         self.setup_splat_robot()
+        # Registered envs pass a factory so rubrics are only built at gym.make time
+        if rubric is None and rubric_factory is not None:
+            rubric = rubric_factory()
         self.rubric = rubric
 
         # Enable target marker if requested
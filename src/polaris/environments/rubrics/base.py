@@ -3,8 +3,12 @@ Base class for task success/progress rubrics.
 """
 
 from dataclasses import dataclass
-from typing import Callable
-from isaaclab.envs import ManagerBasedRLEnv
+from typing import TYPE_CHECKING, Callable
+import numpy as np
+import torch
+
+if TYPE_CHECKING:
+    from isaaclab.envs import ManagerBasedRLEnv
 
 
 @dataclass
@@ -32,9 +36,55 @@ class Rubric:
         """
         self.config = kwargs
         self.criteria = criteria
-        self.criteria_reached = [False] * len(criteria)
+        num_criteria = len(criteria)
+
+        # Structure-of-arrays view of the criteria: checker fns plus, per criterion, a bitmask
+        # with bit i set for each dependency i. Reached state is packed the same way, so the
+        # dependency gate is a single AND/compare.
+        self._fns: list[Callable] = []
+        self._dep_masks: list[int] = []
+        for c in criteria:
+            if isinstance(c, tuple):
+                fn, deps = c
+                mask = sum(1 << i for i in set(deps))
+            else:
+                fn, mask = c, 0
+            self._fns.append(fn)
+            self._dep_masks.append(mask)
+
+        # Dependency-free reach criteria are evaluated together in one batched pass
+        batched = [
+            idx
+            for idx, fn in enumerate(self._fns)
+            if getattr(fn, "kind", None) == "reach" and not self._dep_masks[idx]
+        ]
+        self._reach_bits = [1 << idx for idx in batched]
+        self._reach_objs = [self._fns[idx].obj_name for idx in batched]
+        self._reach_thresh = torch.tensor(
+            [self._fns[idx].threshold for idx in batched], dtype=torch.float32
+        )
+        self._sequential_idx = [idx for idx in range(num_criteria) if idx not in batched]
+
+        self._reached_mask = 0
 
-    def evaluate(self, env: ManagerBasedRLEnv) -> RubricResult:
+    @property
+    def criteria_reached(self) -> np.ndarray:
+        """Max-ever reached state of each criterion, unpacked from the reached bitmask."""
+        mask = self._reached_mask
+        return np.array([bool(mask >> idx & 1) for idx in range(len(self.criteria))])
+
+    def _evaluate_reach(self, env: "ManagerBasedRLEnv") -> np.ndarray:
+        """Evaluate all batched reach criteria with a single device-to-host copy."""
+        ee_pos = env.scene["ee_frame"].data.target_pos_w[0]
+        obj_pos = torch.stack(
+            [env.scene[name].data.root_pos_w[0] for name in self._reach_objs]
+        )
+        if self._reach_thresh.device != obj_pos.device:
+            self._reach_thresh = self._reach_thresh.to(obj_pos.device)
+        dist = torch.linalg.norm(obj_pos - ee_pos, dim=-1)
+        return (dist < self._reach_thresh).cpu().numpy()
+
+    def evaluate(self, env: "ManagerBasedRLEnv") -> RubricResult:
         """
         Evaluate current simulation state and return result.
 
@@ -44,27 +94,30 @@ class Rubric:
             - (callable, [dep_indices]) (only counts if all deps by index are met)
         This allows for some to require others, but leaves most unconstrained.
 
-        Tracks the max-ever reached state for each criterion using self.criteria_reached.
+        Tracks the max-ever reached state for each criterion as a bitmask (see criteria_reached).
         """
         metrics = {}
         num_criteria = len(self.criteria)
+        reached = self._reached_mask
 
-        criteria_met_now = []
-        for idx, c in enumerate(self.criteria):
-            # Check if c is (callable, [deps]), else treat as callable only
-            if isinstance(c, tuple):
-                fn, deps = c
-                # Only evaluate if all deps ever reached
-                deps_met = all(self.criteria_reached[d] for d in deps)
-                result = fn(env) if deps_met else False
-            else:
-                fn = c
-                result = fn(env)
-            # Update max-ever reached for this criterion
-            self.criteria_reached[idx] = self.criteria_reached[idx] or bool(result)
-            criteria_met_now.append(bool(result))
+        # Batched criteria have no deps, so evaluating them first matches in-order evaluation
+        if self._reach_bits:
+            for bit, hit in zip(self._reach_bits, self._evaluate_reach(env)):
+                if hit:
+                    reached |= bit
+
+        for idx in self._sequential_idx:
+            bit = 1 << idx
+            # Max-ever state: a reached criterion never needs re-checking
+            if reached & bit:
+                continue
+            # Only evaluate if all deps ever reached
+            dep_mask = self._dep_masks[idx]
+            if (reached & dep_mask) == dep_mask and self._fns[idx](env):
+                reached |= bit
+        self._reached_mask = reached
 
-        num_reached_ever = sum(self.criteria_reached)
+        num_reached_ever = reached.bit_count()
         progress = num_reached_ever / num_criteria if num_criteria > 0 else 0.0
         metrics["criteria_ever_reached"] = num_reached_ever
         metrics["criteria_total"] = num_criteria
@@ -74,4 +127,4 @@ class Rubric:
 
     def reset(self):
         """Called when environment resets. Override for stateful rubrics."""
-        self.criteria_reached = [False] * len(self.criteria)
+        self._reached_mask = 0
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pxr import Usd, UsdGeom
 from pxr import Gf
 from omni.usd import get_context
@@ -5,33 +7,50 @@ import numpy as np
 import torch
 
 
+# Checker factories are cached on their arguments so identical criteria across
+# environments share one checker. Checkers must therefore stay stateless.
+
+
+@lru_cache(maxsize=None)
 def pose_match(obj_name, target_pos, target_quat=None, pos_threshold=0.05, rot_threshold=0.1):
     """
     Check if object reaches a target pose (position and optionally orientation).
 
     Args:
         obj_name: Name of the object to check
-        target_pos: Target position [x, y, z]
-        target_quat: Optional target quaternion [qw, qx, qy, qz]. If None, only position is checked.
+        target_pos: Target position (x, y, z)
+        target_quat: Optional target quaternion (qw, qx, qy, qz). If None, only position is checked.
         pos_threshold: Position distance threshold (meters)
         rot_threshold: Rotation difference threshold (quaternion distance, ~0.1 = ~11 degrees)
 
     Example:
-        pose_match("wood_cube", [0.39, -0.09, -0.11], [0.54, 0, 0, 0], pos_threshold=0.05)
+        pose_match("wood_cube", (0.39, -0.09, -0.11), (0.54, 0, 0, 0), pos_threshold=0.05)
     """
     target_pos_tensor = torch.tensor(target_pos, dtype=torch.float32)
-    target_quat_tensor = torch.tensor(target_quat, dtype=torch.float32) if target_quat else None
+    target_quat_tensor = None
+    if target_quat is not None:
+        target_quat_tensor = torch.tensor(target_quat, dtype=torch.float32)
+        # Normalized once so 1 - |q1 · q2| is exact for targets written to a few decimals
+        target_quat_tensor = target_quat_tensor / torch.linalg.norm(target_quat_tensor)
+    # Per-device copies of the targets, made on first use instead of every step
+    device_targets = {}
 
     def checker(env):
         obj_pos = env.scene[obj_name].data.root_pos_w[0]
-        pos_dist = torch.norm(obj_pos - target_pos_tensor.to(obj_pos.device))
+        targets = device_targets.get(obj_pos.device)
+        if targets is None:
+            targets = device_targets[obj_pos.device] = (
+                target_pos_tensor.to(obj_pos.device),
+                None if target_quat_tensor is None else target_quat_tensor.to(obj_pos.device),
+            )
+        target_p, target_q = targets
+        pos_dist = torch.norm(obj_pos - target_p)
 
         if pos_dist >= pos_threshold:
             return False
 
-        if target_quat_tensor is not None:
+        if target_q is not None:
             obj_quat = env.scene[obj_name].data.root_quat_w[0]  # [qw, qx, qy, qz]
-            target_q = target_quat_tensor.to(obj_quat.device)
             # Quaternion distance: 1 - |q1 · q2|
             dot = torch.abs(torch.sum(obj_quat * target_q))
             rot_dist = 1.0 - dot
@@ -43,6 +62,7 @@ def pose_match(obj_name, target_pos, target_quat=None, pos_threshold=0.05, rot_t
     return checker
 
 
+@lru_cache(maxsize=None)
 def reach(obj_name, threshold=0.05):
     """
     Returns a checker function that expects (env).
@@ -55,21 +75,28 @@ def reach(obj_name, threshold=0.05):
         dist = torch.norm(obj_pos - ee_pos)
         return dist < threshold
 
+    # Lets Rubric batch reach criteria instead of calling them one by one
+    checker.kind = "reach"
+    checker.obj_name = obj_name
+    checker.threshold = threshold
     return checker
 
 
+@lru_cache(maxsize=None)
 def lift(obj_name, threshold=0.05, default_height=None):
     def checker(env):
-        nonlocal default_height
         object_pos = env.scene[obj_name].data.root_pos_w[0]
         if default_height is None:
-            default_height = env.scene[obj_name].data.default_root_state[0, 2]
+            height = env.scene[obj_name].data.default_root_state[0, 2]
+        else:
+            height = default_height
 
-        return (object_pos[2] - default_height).item() > threshold
+        return (object_pos[2] - height).item() > threshold
 
     return checker
 
 
+@lru_cache(maxsize=None)
 def is_within_xy(object1, object2, percent_threshold=0.5, open_finger_threshold=0.1):
     """
     Check if object1 is inside object2.
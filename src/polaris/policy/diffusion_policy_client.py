@@ -13,13 +13,58 @@ Usage:
         --policy.client DiffusionPolicy --policy.port 8000
 """
 
+import socket
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 import cv2
-from openpi_client import websocket_client_policy, image_tools
+from openpi_client import image_tools, websocket_client_policy
+from websockets.exceptions import WebSocketException
 from polaris.policy.abstract_client import InferenceClient
 from polaris.config import PolicyArgs
 
 
+@lru_cache(maxsize=8)
+def _pad_layout(
+    cur_height: int, cur_width: int, height: int, width: int
+) -> tuple[tuple[int, int], tuple[int, int, int, int]]:
+    """Resized (width, height) and (top, bottom, left, right) padding for resize_with_pad."""
+    ratio = max(cur_width / width, cur_height / height)
+    resized_height = int(cur_height / ratio)
+    resized_width = int(cur_width / ratio)
+    top = (height - resized_height) // 2
+    left = (width - resized_width) // 2
+    return (resized_width, resized_height), (
+        top,
+        height - resized_height - top,
+        left,
+        width - resized_width - left,
+    )
+
+
+def _resize_with_pad(
+    image: np.ndarray, height: int, width: int, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    cv2 version of openpi's image_tools.resize_with_pad for one HWC uint8 image:
+    resize keeping the aspect ratio, then zero-pad to (height, width), centered.
+    The source is read once (by the SIMD resize); padding only touches the output.
+    If given, `out` (which may be a view into a larger array) receives the result.
+    Uses INTER_AREA, so pixels differ slightly from openpi's PIL bilinear output.
+    """
+    cur_height, cur_width = image.shape[:2]
+    if (cur_height, cur_width) == (height, width):
+        if out is None:
+            return image
+        out[...] = image
+        return out
+    size, padding = _pad_layout(cur_height, cur_width, height, width)
+    resized = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return cv2.copyMakeBorder(resized, *padding, cv2.BORDER_CONSTANT, dst=out, value=0)
+
+
 @InferenceClient.register(client_name="DiffusionPolicy")
 class DiffusionPolicyClient(InferenceClient):
     """
@@ -31,8 +76,15 @@ class DiffusionPolicyClient(InferenceClient):
     3. Sends observations to the server
     4. Returns actions in the expected format
 
+    Images are always sent as HWC uint8; a server that wants float input should
+    convert (/ 255) on its side, so the request carries a quarter of the bytes.
+
     The client supports action chunking - it receives a sequence of actions
     from the server and executes them in open-loop before requesting new actions.
+    With `prefetch`, the next chunk is requested in the background while the last
+    action of the current chunk executes, hiding the image preprocessing and the
+    server round-trip from the control loop. The chunk is then computed from the
+    observation one step before it starts.
     """
 
     def __init__(self, args: PolicyArgs) -> None:
@@ -53,6 +105,12 @@ class DiffusionPolicyClient(InferenceClient):
         # Image size - should match what the server expects
         self.image_size = getattr(args, 'image_size', 224)
 
+        # Resize with cv2 (INTER_AREA) instead of openpi's PIL bilinear resize_with_pad
+        self.fast_resize = args.fast_resize
+
+        # Request the next chunk one step early, from the penultimate action's observation
+        self.prefetch = args.prefetch
+
         # Connect to server
         self.client = websocket_client_policy.WebsocketClientPolicy(
             host=args.host, port=args.port
@@ -77,17 +135,28 @@ class DiffusionPolicyClient(InferenceClient):
         self.actions_from_chunk_completed = 0
         self.pred_action_chunk = None
 
+        # Prefetch state. The websocket client isn't thread-safe, so every request made
+        # while a prefetch may be in flight goes through this single worker.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="policy-infer")
+        self._pending_future: Future | None = None
+
     @property
     def rerender(self) -> bool:
         """
         Whether to rerender the visualization.
 
-        Returns True when we need new observations (at the start or after
-        completing the current action chunk).
+        Returns True when the next infer() call sends new observations to the
+        server (at the start, after completing the current action chunk, or
+        one step before that when prefetching).
         """
-        return (
+        if (
             self.actions_from_chunk_completed == 0
             or self.actions_from_chunk_completed >= self.open_loop_horizon
+        ):
+            return self._pending_future is None
+        return (
+            self.prefetch
+            and self.actions_from_chunk_completed == self.open_loop_horizon - 1
         )
 
     def reset(self):
@@ -95,9 +164,14 @@ class DiffusionPolicyClient(InferenceClient):
         self.actions_from_chunk_completed = 0
         self.pred_action_chunk = None
 
+        # Drop any prefetched chunk; the reset below is queued behind it if in flight
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+        self._pending_future = None
+
         # Notify server of reset
         try:
-            self.client.infer({"reset": True})
+            self._executor.submit(self._safe_infer, {"reset": True}).result()
         except Exception:
             pass  # Server might not support reset signal
 
@@ -121,51 +195,34 @@ class DiffusionPolicyClient(InferenceClient):
         """
         viz = None
 
-        # Check if we need to query the server for new actions
+        # Check if we need new actions
         if (
             self.actions_from_chunk_completed == 0
             or self.actions_from_chunk_completed >= self.open_loop_horizon
         ):
-            # Extract and preprocess observation
-            curr_obs = self._extract_observation(obs)
-
-            # Reset chunk counter
-            self.actions_from_chunk_completed = 0
+            if self._pending_future is not None:
+                # Use the chunk prefetched during the previous step
+                server_response, viz = self._pending_future.result()
+                self._pending_future = None
+            else:
+                server_response, viz = self._request_chunk(
+                    self._extract_observation(obs), instruction
+                )
+            self._apply_response(server_response)
 
-            # Resize images to expected size
-            external_image = image_tools.resize_with_pad(
-                curr_obs["external_image"], self.image_size, self.image_size
-            )
-            wrist_image = image_tools.resize_with_pad(
-                curr_obs["wrist_image"], self.image_size, self.image_size
+        elif (
+            self.prefetch
+            and self.actions_from_chunk_completed == self.open_loop_horizon - 1
+        ):
+            # Preprocess and query the server for the next chunk while the last action
+            # executes. Only the proprio readout has to happen now, before the sim steps.
+            self._pending_future = self._executor.submit(
+                self._request_chunk, self._extract_observation(obs), instruction
             )
 
-            # Build request in OpenPI format
-            request_data = {
-                "observation/exterior_image_1_left": external_image,
-                "observation/wrist_image_left": wrist_image,
-                "observation/joint_position": curr_obs["joint_position"],
-                "observation/gripper_position": curr_obs["gripper_position"],
-                "prompt": instruction,
-            }
-
-            # Query server
-            server_response = self.client.infer(request_data)
-            self.pred_action_chunk = server_response["actions"]
-
-            # Create visualization
-            viz = np.concatenate([external_image, wrist_image], axis=1)
-
         # Generate visualization if requested but not already created
         if return_viz and viz is None:
-            curr_obs = self._extract_observation(obs)
-            external_image = image_tools.resize_with_pad(
-                curr_obs["external_image"], self.image_size, self.image_size
-            )
-            wrist_image = image_tools.resize_with_pad(
-                curr_obs["wrist_image"], self.image_size, self.image_size
-            )
-            viz = np.concatenate([external_image, wrist_image], axis=1)
+            viz = self.visualize(obs)
 
         # Get current action from chunk
         if self.pred_action_chunk is None:
@@ -174,13 +231,97 @@ class DiffusionPolicyClient(InferenceClient):
         action = self.pred_action_chunk[self.actions_from_chunk_completed]
         self.actions_from_chunk_completed += 1
 
-        # Binarize gripper action (standard for DROID)
-        if action[-1].item() > 0.5:
-            action = np.concatenate([action[:-1], np.ones((1,))])
-        else:
-            action = np.concatenate([action[:-1], np.zeros((1,))])
+        # Binarize gripper action (standard for DROID), on a copy so the chunk is untouched
+        action = np.array(action, dtype=np.float32)
+        action[-1] = action[-1] > 0.5
 
-        return action.astype(np.float32), viz
+        return action, viz
+
+    def _safe_infer(self, request_data: dict, retries: int = 1) -> dict:
+        """
+        Send a request over the persistent websocket. If the server dropped the
+        connection, reconnect (backing off exponentially) and resend the request,
+        up to `retries` times. Raises the last error once they are used up, so a
+        dead server fails the eval instead of hanging it.
+        """
+        for attempt in range(retries + 1):
+            try:
+                if attempt > 0:
+                    self._reconnect()
+                    print("Reconnected to policy server")
+                return self.client.infer(request_data)
+            except (OSError, WebSocketException) as e:
+                # A dropped connection (ConnectionClosed) or a failed reconnect
+                if attempt == retries:
+                    raise
+                delay = 0.5 * 2**attempt
+                print(f"Policy server connection lost ({e}), reconnecting in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _reconnect(self, timeout: float = 10.0) -> None:
+        """
+        Replace the client with a new connection to the server. WebsocketClientPolicy
+        can wait for a refused server forever, so first check, for at most `timeout`
+        seconds, that the server accepts connections again.
+        """
+        with socket.create_connection((self.args.host, self.args.port), timeout=timeout):
+            pass
+        self.client = websocket_client_policy.WebsocketClientPolicy(
+            host=self.args.host, port=self.args.port
+        )
+
+    def _request_chunk(self, curr_obs: dict, instruction: str) -> tuple[dict, np.ndarray]:
+        """Build a request from an extracted observation and send it. Returns the
+        server response and the camera views that were sent."""
+        request_data, viz = self._build_request(curr_obs, instruction)
+        return self._safe_infer(request_data), viz
+
+    def _build_request(self, curr_obs: dict, instruction: str) -> tuple[dict, np.ndarray]:
+        """
+        Preprocess an extracted observation into a server request (OpenPI format).
+        Also returns the side-by-side camera views the request images are slices of.
+        """
+        # Resize images to expected size
+        viz = self._prep_images(curr_obs)
+
+        request_data = {
+            "observation/exterior_image_1_left": viz[:, : self.image_size],
+            "observation/wrist_image_left": viz[:, self.image_size :],
+            "observation/joint_position": curr_obs["joint_position"],
+            "observation/gripper_position": curr_obs["gripper_position"],
+            "prompt": instruction,
+        }
+        return request_data, viz
+
+    def _prep_images(self, curr_obs: dict) -> np.ndarray:
+        """
+        Preprocess both cameras straight into the halves of one (S, 2S, 3) array,
+        instead of resizing each and concatenating. A new array per call, since
+        callers keep the returned views (e.g. as video frames).
+        """
+        size = self.image_size
+        viz = np.empty((size, 2 * size, 3), dtype=np.uint8)
+        self._prep_image(curr_obs["external_image"], out=viz[:, :size])
+        self._prep_image(curr_obs["wrist_image"], out=viz[:, size:])
+        return viz
+
+    def _prep_image(self, image: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Resize and pad a camera frame to the size the server expects, as uint8."""
+        if image.dtype != np.uint8:
+            # Float frames are in [0, 1]; quantize before resizing so only bytes go out
+            image = (np.clip(image, 0.0, 1.0) * 255).astype(np.uint8)
+        if self.fast_resize:
+            return _resize_with_pad(image, self.image_size, self.image_size, out=out)
+        resized = image_tools.resize_with_pad(image, self.image_size, self.image_size)
+        if out is None:
+            return resized
+        out[...] = resized
+        return out
+
+    def _apply_response(self, server_response: dict) -> None:
+        """Start executing the action chunk returned by the server."""
+        self.pred_action_chunk = server_response["actions"]
+        self.actions_from_chunk_completed = 0
 
     def _extract_observation(self, obs_dict: dict) -> dict:
         """
@@ -202,14 +343,9 @@ class DiffusionPolicyClient(InferenceClient):
 
         # Extract proprioceptive state
         robot_state = obs_dict["policy"]
-        joint_position = robot_state["arm_joint_pos"].clone().detach().cpu().numpy()
-        gripper_position = robot_state["gripper_pos"].clone().detach().cpu().numpy()
-
-        # Handle batch dimension
-        if joint_position.ndim > 1:
-            joint_position = joint_position[0]
-        if gripper_position.ndim > 1:
-            gripper_position = gripper_position[0]
+        # Single env, so flattening drops the batch dimension: (1, 7) or (7,) -> (7,)
+        joint_position = robot_state["arm_joint_pos"].detach().cpu().numpy().reshape(-1)
+        gripper_position = robot_state["gripper_pos"].detach().cpu().numpy().reshape(-1)
 
         return {
             "external_image": external_image,
@@ -228,11 +364,4 @@ class DiffusionPolicyClient(InferenceClient):
         Returns:
             Concatenated camera views as np.ndarray
         """
-        curr_obs = self._extract_observation(obs)
-        external_image = image_tools.resize_with_pad(
-            curr_obs["external_image"], self.image_size, self.image_size
-        )
-        wrist_image = image_tools.resize_with_pad(
-            curr_obs["wrist_image"], self.image_size, self.image_size
-        )
-        return np.concatenate([external_image, wrist_image], axis=1)
+        return self._prep_images(self._extract_observation(obs))
@@ -85,11 +85,9 @@ class DroidJointPosClient(InferenceClient):
         action = self.pred_action_chunk[self.actions_from_chunk_completed]
         self.actions_from_chunk_completed += 1
 
-        # binarize gripper action
-        if action[-1].item() > 0.5:
-            action = np.concatenate([action[:-1], np.ones((1,))])
-        else:
-            action = np.concatenate([action[:-1], np.zeros((1,))])
+        # binarize gripper action, on a (float64) copy so the chunk is untouched
+        action = action.astype(np.float64)
+        action[-1] = action[-1] > 0.5
 
         return action, both
 
@@ -100,8 +98,8 @@ class DroidJointPosClient(InferenceClient):
 
         # Capture proprioceptive state
         robot_state = obs_dict["policy"]
-        joint_position = robot_state["arm_joint_pos"].clone().detach().cpu().numpy()[0]
-        gripper_position = robot_state["gripper_pos"].clone().detach().cpu().numpy()[0]
+        joint_position = robot_state["arm_joint_pos"].detach().cpu().numpy()[0]
+        gripper_position = robot_state["gripper_pos"].detach().cpu().numpy()[0]
 
         return {
             "right_image": right_image,
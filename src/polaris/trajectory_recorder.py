@@ -5,13 +5,31 @@ Records trajectories in HDF5 format for conversion to LeRobot dataset.
 Adapted from SimEval DROID recorder with Polaris-specific observation structure.
 """
 
+import cv2
 import h5py
 import numpy as np
 import torch
+import time
 from pathlib import Path
 from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
+# Writes allowed to queue up behind the writer thread before record_step waits
+_MAX_PENDING_WRITES = 16
+
+# Proprio observations as (dataset name, obs["policy"] key), in the order their
+# columns are packed into one buffer row per step
+_PROPRIO_FIELDS = (
+    ("joint_position", "arm_joint_pos"),  # (7,)
+    ("joint_velocity", "arm_joint_vel"),  # (7,)
+    ("gripper_position", "gripper_pos"),  # (1,)
+    ("gripper_velocity", "gripper_vel"),  # (1,)
+    ("ee_pose", "ee_pose"),  # (7,) xyz + quat
+    ("ee_velocity", "ee_vel"),  # (6,) linear + angular
+)
+
 
 class PolarisTrajectoryRecorder:
     """Records trajectories from Polaris environment to HDF5 format.
@@ -29,13 +47,29 @@ class PolarisTrajectoryRecorder:
     - Proprioceptive state comes from obs["policy"] group
     - Uses original 720x1280 resolution (no downsampling)
     - Includes task_id and rubric success/progress metadata
+
+    Camera frames are stored as raw uint8 by default. With jpeg_quality set, they are
+    JPEG-encoded per step and stored as variable-length uint8 datasets (attribute
+    encoding="jpeg") instead. Decode frame i with
+    `cv2.cvtColor(cv2.imdecode(ds[i], cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)` or
+    `PIL.Image.open(io.BytesIO(ds[i].tobytes()))`.
+
+    Camera frames are streamed into resizable datasets as they are recorded, so memory
+    does not grow with episode length; the small proprio/action arrays are buffered and
+    written when the episode ends.
     """
 
-    def __init__(self, output_dir: str):
+    def __init__(
+        self, output_dir: str, max_steps: int = 1024, jpeg_quality: int | None = None
+    ):
         """Initialize trajectory recorder.
 
         Args:
             output_dir: Directory to save trajectory file
+            max_steps: Initial per-episode step capacity of the recording buffers
+                (they grow if an episode runs longer)
+            jpeg_quality: JPEG quality to store camera frames with, or None (default) to
+                store them as raw uint8
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -49,6 +83,23 @@ class PolarisTrajectoryRecorder:
         self.episode_count = 0
         self.episode_data = {}
 
+        # Per-step buffers for everything but camera frames, preallocated on first use
+        # and reused across episodes. Proprio is packed into a single "proprio" buffer,
+        # (steps, 29), whose columns are split back out at the end of the episode.
+        self.max_steps = max_steps
+        self.jpeg_quality = jpeg_quality
+        self._buffers: dict[str, dict[str, np.ndarray]] = {
+            "observations": {},
+            "actions": {},
+        }
+        self._num_steps = 0
+        self._proprio_sizes: list[int] = []
+
+        # All HDF5 access happens in order on one background writer thread
+        self._writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recorder")
+        self._pending_writes: deque[Future] = deque()
+        self._h5: h5py.File | None = None
+
         # Recording state
         self.is_recording = False
         self.start_time = None
@@ -64,26 +115,13 @@ class PolarisTrajectoryRecorder:
             raise RuntimeError("Episode already in progress. Call end_episode() first.")
 
         self.is_recording = True
-        self.start_time = datetime.now().timestamp()
+        self.start_time = time.perf_counter()
         self.current_episode = self.episode_count
 
-        # Initialize episode data storage
+        # Camera frames are streamed to the file; the rest goes into self._buffers and
+        # observations/actions are filled in at the end
+        self._num_steps = 0
         self.episode_data = {
-            "observations": {
-                "external_cam": [],
-                "wrist_cam": [],
-                "joint_position": [],
-                "joint_velocity": [],
-                "gripper_position": [],
-                "gripper_velocity": [],
-                "ee_pose": [],
-                "ee_velocity": [],
-                "timestamp": [],
-            },
-            "actions": {
-                "joint_position_command": [],
-                "gripper_command": [],
-            },
             "metadata": {
                 "instruction": instruction,
                 "task_id": task_id,
@@ -110,41 +148,97 @@ class PolarisTrajectoryRecorder:
         external_cam = self._to_numpy(splat_obs["external_cam"])  # (720, 1280, 3) uint8
         wrist_cam = self._to_numpy(splat_obs["wrist_cam"])  # (720, 1280, 3) uint8
 
-        # Extract proprioceptive state from policy group
+        # Extract proprioceptive and end-effector state from policy group, as one row
         policy_obs = obs["policy"]
-        joint_pos = self._to_numpy(policy_obs["arm_joint_pos"])  # (7,)
-        joint_vel = self._to_numpy(policy_obs["arm_joint_vel"])  # (7,)
-        gripper_pos = self._to_numpy(policy_obs["gripper_pos"])  # (1,)
-        gripper_vel = self._to_numpy(policy_obs["gripper_vel"])  # (1,)
-
-        # Extract end-effector state
-        ee_pose = self._to_numpy(policy_obs["ee_pose"])  # (7,) xyz + quat
-        ee_vel = self._to_numpy(policy_obs["ee_vel"])  # (6,) linear + angular
+        proprio, self._proprio_sizes = self._to_numpy_flat(
+            [policy_obs[key] for _, key in _PROPRIO_FIELDS]
+        )
 
         # Record timestamp (relative to episode start)
-        timestamp = datetime.now().timestamp() - self.start_time
-
-        # Append to episode data
-        self.episode_data["observations"]["external_cam"].append(external_cam)
-        self.episode_data["observations"]["wrist_cam"].append(wrist_cam)
-        self.episode_data["observations"]["joint_position"].append(joint_pos)
-        self.episode_data["observations"]["joint_velocity"].append(joint_vel)
-        self.episode_data["observations"]["gripper_position"].append(gripper_pos)
-        self.episode_data["observations"]["gripper_velocity"].append(gripper_vel)
-        self.episode_data["observations"]["ee_pose"].append(ee_pose)
-        self.episode_data["observations"]["ee_velocity"].append(ee_vel)
-        self.episode_data["observations"]["timestamp"].append(timestamp)
+        timestamp = time.perf_counter() - self.start_time
+
+        # Stream the camera frames to the file (and JPEG-encode them) on the writer thread
+        self._submit(
+            self._write_frames,
+            f"episode_{self.current_episode}",
+            self._num_steps,
+            {"external_cam": external_cam, "wrist_cam": wrist_cam},
+        )
+
+        # Write the rest into the step buffers
+        self._write("observations", "proprio", proprio)
+        self._write("observations", "timestamp", np.float64(timestamp))
 
         # Record actions
         action = np.asarray(action, dtype=np.float32)
         joint_cmd = action[:7]  # First 7 are joint commands
         gripper_cmd = action[7:8]  # Last one is gripper
 
-        self.episode_data["actions"]["joint_position_command"].append(joint_cmd)
-        self.episode_data["actions"]["gripper_command"].append(gripper_cmd)
+        self._write("actions", "joint_position_command", joint_cmd)
+        self._write("actions", "gripper_command", gripper_cmd)
+
+        self._num_steps += 1
+
+    def _write(self, group: str, key: str, value: np.ndarray):
+        """Write this step's `value` into its buffer, (re)allocating it if needed."""
+        value = np.asarray(value)
+        buffer = self._buffers[group].get(key)
+        if buffer is None or buffer.shape[1:] != value.shape or buffer.dtype != value.dtype:
+            if self._num_steps > 0:
+                raise ValueError(
+                    f"{group}/{key} changed to {value.shape} {value.dtype} mid-episode"
+                )
+            buffer = np.empty((self.max_steps, *value.shape), dtype=value.dtype)
+            self._buffers[group][key] = buffer
+        elif self._num_steps >= len(buffer):
+            # Episode is longer than the buffer: double it
+            grown = np.empty((2 * len(buffer), *value.shape), dtype=value.dtype)
+            grown[: len(buffer)] = buffer
+            buffer = self._buffers[group][key] = grown
+        buffer[self._num_steps] = value
+
+    def _encode_jpeg(self, key: str, frame: np.ndarray) -> np.ndarray:
+        """JPEG-encode an RGB `frame` into a flat uint8 array."""
+        ok, encoded = cv2.imencode(
+            ".jpg",
+            cv2.cvtColor(frame, cv2.COLOR_RGB2BGR),
+            [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality],
+        )
+        if not ok:
+            raise RuntimeError(f"Failed to JPEG-encode observations/{key}")
+        return encoded.reshape(-1)
+
+    def _write_frames(self, name: str, step: int, frames: dict[str, np.ndarray]):
+        """Append one step's camera frames to the episode's datasets, creating them on
+        the first step. Runs on the writer thread."""
+        obs_group = self._get_h5().require_group(f"{name}/observations")
+        for key, frame in frames.items():
+            if self.jpeg_quality is not None:
+                frame = self._encode_jpeg(key, frame)
+            if step == 0:
+                if self.jpeg_quality is None:
+                    # LZF is much faster than gzip on frames; one chunk per frame
+                    ds = obs_group.create_dataset(
+                        key,
+                        shape=(0, *frame.shape),
+                        maxshape=(None, *frame.shape),
+                        chunks=(1, *frame.shape),
+                        dtype=frame.dtype,
+                        compression="lzf",
+                    )
+                else:
+                    # One variable-length uint8 array per step
+                    ds = obs_group.create_dataset(
+                        key, shape=(0,), maxshape=(None,), dtype=h5py.vlen_dtype(np.uint8)
+                    )
+                    ds.attrs["encoding"] = "jpeg"
+            else:
+                ds = obs_group[key]
+            ds.resize(step + 1, axis=0)
+            ds[step] = frame
 
     def end_episode(self, rubric_result: Optional[dict] = None):
-        """End the current episode and save to HDF5.
+        """End the current episode and save it to HDF5 in the background.
 
         Args:
             rubric_result: Optional rubric evaluation result with success/progress
@@ -153,8 +247,7 @@ class PolarisTrajectoryRecorder:
             print("[Recorder] Warning: No episode in progress.")
             return
 
-        # Stack all timesteps into arrays
-        episode_length = len(self.episode_data["observations"]["timestamp"])
+        episode_length = self._num_steps
 
         if episode_length == 0:
             print("[Recorder] Warning: Episode has no data. Skipping.")
@@ -163,16 +256,19 @@ class PolarisTrajectoryRecorder:
 
         print(f"[Recorder] Ending episode {self.episode_count} ({episode_length} steps)")
 
-        # Convert lists to numpy arrays
-        for obs_key in self.episode_data["observations"]:
-            self.episode_data["observations"][obs_key] = np.stack(
-                self.episode_data["observations"][obs_key], axis=0
-            )
+        # Copy out the filled part of the buffers so they can be reused right away
+        for group, buffers in self._buffers.items():
+            self.episode_data[group] = {
+                key: buffer[:episode_length].copy() for key, buffer in buffers.items()
+            }
 
-        for action_key in self.episode_data["actions"]:
-            self.episode_data["actions"][action_key] = np.stack(
-                self.episode_data["actions"][action_key], axis=0
-            )
+        # Split the packed proprio columns back into one dataset per field
+        observations = self.episode_data["observations"]
+        columns = np.split(
+            observations.pop("proprio"), np.cumsum(self._proprio_sizes)[:-1], axis=1
+        )
+        for (name, _), column in zip(_PROPRIO_FIELDS, columns):
+            observations[name] = column
 
         # Add episode length and rubric result to metadata
         self.episode_data["metadata"]["episode_length"] = episode_length
@@ -180,51 +276,92 @@ class PolarisTrajectoryRecorder:
             self.episode_data["metadata"]["success"] = rubric_result.get("success", False)
             self.episode_data["metadata"]["progress"] = rubric_result.get("progress", 0.0)
 
-        # Save to HDF5
-        self._save_episode_to_hdf5()
+        # Save to HDF5 off the main loop, after the episode's frames
+        self._submit(self._write_episode, f"episode_{self.current_episode}", self.episode_data)
 
         # Increment episode counter and reset state
         self.episode_count += 1
         self.is_recording = False
         self.episode_data = {}
 
-    def _save_episode_to_hdf5(self):
-        """Save current episode data to HDF5 file."""
-        with h5py.File(self.filepath, "a") as f:
-            ep_group = f.create_group(f"episode_{self.current_episode}")
-
-            # Save observations
-            obs_group = ep_group.create_group("observations")
-            for key, data in self.episode_data["observations"].items():
-                obs_group.create_dataset(key, data=data, compression="gzip")
-
-            # Save actions
-            action_group = ep_group.create_group("actions")
-            for key, data in self.episode_data["actions"].items():
-                action_group.create_dataset(key, data=data, compression="gzip")
-
-            # Save metadata
-            meta_group = ep_group.create_group("metadata")
-            for key, value in self.episode_data["metadata"].items():
-                if isinstance(value, str):
-                    meta_group.attrs[key] = value
-                else:
-                    meta_group.attrs[key] = value
+    def _submit(self, fn, *args):
+        """Queue a write on the writer thread, first waiting for the oldest ones if too
+        many are pending (which also surfaces their errors)."""
+        while len(self._pending_writes) >= _MAX_PENDING_WRITES:
+            self._pending_writes.popleft().result()
+        self._pending_writes.append(self._writer_pool.submit(fn, *args))
+
+    def _wait_for_writes(self):
+        """Block until everything queued so far is written."""
+        while self._pending_writes:
+            self._pending_writes.popleft().result()
+
+    def _get_h5(self) -> h5py.File:
+        """The trajectory file, opened on first use and kept open until save()."""
+        if self._h5 is None:
+            self._h5 = h5py.File(
+                self.filepath, "a", libver="latest", rdcc_nbytes=64 * 1024 * 1024
+            )
+        return self._h5
+
+    def _write_episode(self, name: str, payload: dict):
+        """Write one episode and flush it to disk. Runs on the writer thread."""
+        f = self._get_h5()
+        self._save_episode_to_hdf5_payload(f, name, payload)
+        f.flush()
+
+    @staticmethod
+    def _save_episode_to_hdf5_payload(f: h5py.File, name: str, payload: dict):
+        """Save one episode's data to the open HDF5 file. Runs on the writer thread."""
+        # The group and its camera datasets already exist from streaming the frames
+        ep_group = f.require_group(name)
+
+        # Save observations
+        obs_group = ep_group.require_group("observations")
+        for key, data in payload["observations"].items():
+            obs_group.create_dataset(key, data=data, compression="gzip")
+
+        # Save actions
+        action_group = ep_group.create_group("actions")
+        for key, data in payload["actions"].items():
+            action_group.create_dataset(key, data=data, compression="gzip")
+
+        # Save metadata
+        meta_group = ep_group.create_group("metadata")
+        for key, value in payload["metadata"].items():
+            if isinstance(value, str):
+                meta_group.attrs[key] = value
+            else:
+                meta_group.attrs[key] = value
 
     def save(self):
-        """Finalize and close the HDF5 file."""
+        """Finalize the HDF5 file, waiting for pending writes. No recording afterwards."""
         if self.is_recording:
             print("[Recorder] Warning: Episode still in progress. Ending it.")
             self.end_episode()
 
+        # Wait for the last episode to be written
+        self._wait_for_writes()
+        self._writer_pool.shutdown(wait=True)
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
         print(f"[Recorder] Saved {self.episode_count} episodes to {self.filepath}")
 
+    def _to_numpy_flat(self, tensors: list) -> tuple[np.ndarray, list[int]]:
+        """Concatenate single-env tensors into one flat numpy array with one
+        device-to-host copy. Also returns the size of each tensor."""
+        if not all(isinstance(t, torch.Tensor) for t in tensors):
+            arrays = [self._to_numpy(t).reshape(-1) for t in tensors]
+            return np.concatenate(arrays), [a.size for a in arrays]
+        flat = torch.cat([t.detach().reshape(-1) for t in tensors]).cpu().numpy()
+        return flat, [t.numel() for t in tensors]
+
     def _to_numpy(self, tensor):
         """Convert torch tensor to numpy array, handling batch dimension."""
         if isinstance(tensor, torch.Tensor):
             arr = tensor.cpu().numpy()
-            # Remove batch dimension if present
-            if arr.shape[0] == 1:
-                arr = arr[0]
-            return arr
+            # Remove batch dimension if present (a view, no copy)
+            return arr[0] if arr.ndim > 1 and arr.shape[0] == 1 else arr
         return np.asarray(tensor)
@@ -3,9 +3,10 @@ import torch
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from isaaclab.envs import ManagerBasedRLEnvCfg
-from isaaclab_tasks.utils import load_cfg_from_registry
+if TYPE_CHECKING:
+    from isaaclab.envs import ManagerBasedRLEnvCfg
 
 DATA_PATH = (
     Path("./PolaRiS-Hub").resolve()
@@ -69,7 +70,7 @@ def parse_env_cfg(
     device: str = "cuda:0",
     num_envs: int | None = None,
     use_fabric: bool | None = None,
-) -> ManagerBasedRLEnvCfg:
+) -> "ManagerBasedRLEnvCfg":
     """
     Parse configuration for an environment and override based on inputs.
     Adapted from isaaclab_tasks.utils.parse_env_cfg.
@@ -79,6 +80,8 @@ def parse_env_cfg(
     usd_file: str
         Path to USD file we want to use
     """
+    from isaaclab_tasks.utils import load_cfg_from_registry
+
     # load the default configuration
     cfg = load_cfg_from_registry(task_name.split(":")[-1], "env_cfg_entry_point")
 